@@ -16,13 +16,25 @@
 
 from collections import deque
 
+# Precomputed XML tags of the Boolean formula connectives.
+# The K/N 'atleast' opening tag is computed with its min attribute.
+_CONNECTIVES = ("and", "or", "atleast", "not", "xor", "nand", "nor", "iff",
+                "imply")
+_OPEN_TAGS = {x: "<%s>\n" % x for x in _CONNECTIVES if x != "atleast"}
+_CLOSE_TAGS = {x: "</%s>" % x for x in _CONNECTIVES}
+# Formats of argument references with only the name left to fill in.
+_ARG_FORMATS = {
+    x: "<%s name=\"%%s\"/>\n" % x
+    for x in ("gate", "basic-event", "house-event", "event")
+}
+
 
 class Event:
     """Representation of a base class for an event in a fault tree.
 
     Attributes:
         name: A specific name that identifies this node.
-        parents: A set of parents of this node.
+        parents: A list of unique parents of this node.
     """
 
     def __init__(self, name):
@@ -34,7 +46,7 @@ class Event:
             name: Identifier for the node.
         """
         self.name = name
-        self.parents = set()
+        self.parents = []
 
     def is_common(self):
         """Indicates if this node appears in several places."""
@@ -55,7 +67,7 @@ class Event:
             gate: The gate where this node appears.
         """
         assert gate not in self.parents
-        self.parents.add(gate)
+        self.parents.append(gate)
 
 
 class BasicEvent(Event):
@@ -76,10 +88,12 @@ class BasicEvent(Event):
         self.prob = prob
 
     def to_xml(self, printer):
-        """Produces the Open-PSA MEF XML definition of the basic event."""
-        printer('<define-basic-event name="', self.name, '">')
-        printer('<float value="', self.prob, '"/>')
-        printer('</define-basic-event>')
+        """Produces the Open-PSA MEF XML definition of the basic event.
+
+        The probability is written with the fixed precision of 7 digits.
+        """
+        printer('<define-basic-event name="%s">\n<float value="%.6e"/>\n'
+                '</define-basic-event>' % (self.name, self.prob))
 
     def to_aralia(self, printer):
         """Produces the Aralia definition of the basic event."""
@@ -105,9 +119,8 @@ class HouseEvent(Event):
 
     def to_xml(self, printer):
         """Produces the Open-PSA MEF XML definition of the house event."""
-        printer('<define-house-event name="', self.name, '">')
-        printer('<constant value="', self.state, '"/>')
-        printer('</define-house-event>')
+        printer('<define-house-event name="%s">\n<constant value="%s"/>\n'
+                '</define-house-event>' % (self.name, self.state))
 
     def to_aralia(self, printer):
         """Produces the Aralia definition of the house event."""
@@ -139,10 +152,10 @@ class Gate(Event):  # pylint: disable=too-many-instance-attributes
         self.mark = None
         self.operator = operator
         self.k_num = k_num
-        self.g_arguments = set()
-        self.b_arguments = set()
-        self.h_arguments = set()
-        self.u_arguments = set()
+        self.g_arguments = []
+        self.b_arguments = []
+        self.h_arguments = []
+        self.u_arguments = []
 
     def num_arguments(self):
         """Returns the number of arguments."""
@@ -153,7 +166,7 @@ class Gate(Event):  # pylint: disable=too-many-instance-attributes
     def add_argument(self, argument):
         """Adds argument into a collection of gate arguments.
 
-        Note that this function also updates the parent set of the argument.
+        Note that this function also updates the parents of the argument.
         Duplicate arguments are ignored.
         The logic of the Boolean operator is not taken into account
         upon adding arguments to the gate.
@@ -162,17 +175,24 @@ class Gate(Event):  # pylint: disable=too-many-instance-attributes
 
         Args:
             argument: Gate, HouseEvent, BasicEvent, or Event argument.
+
+        Returns:
+            True if the argument is added, False if it is a duplicate.
         """
-        argument.parents.add(self)
         if isinstance(argument, Gate):
-            self.g_arguments.add(argument)
+            arguments = self.g_arguments
         elif isinstance(argument, BasicEvent):
-            self.b_arguments.add(argument)
+            arguments = self.b_arguments
         elif isinstance(argument, HouseEvent):
-            self.h_arguments.add(argument)
+            arguments = self.h_arguments
         else:
             assert isinstance(argument, Event)
-            self.u_arguments.add(argument)
+            arguments = self.u_arguments
+        if argument in arguments:
+            return False
+        arguments.append(argument)
+        argument.parents.append(self)
+        return True
 
     def get_ancestors(self):
         """Collects ancestors from this gate.
@@ -197,44 +217,39 @@ class Gate(Event):  # pylint: disable=too-many-instance-attributes
             nest: Nesting of NOT connectives in formulas.
         """
 
-        def arg_to_xml(type_str, arg):
-            """Produces XML string representation of an argument."""
-            return "<%s name=\"%s\"/>\n" % (type_str, arg.name)
-
-        def args_to_xml(type_str, args):
-            """Produces XML string representation of arguments."""
-            return "".join(arg_to_xml(type_str, arg) for arg in args)
+        def args_to_xml(type_str, args, parts):
+            """Appends XML string representations of arguments."""
+            arg_format = _ARG_FORMATS[type_str]
+            parts.extend(arg_format % arg.name for arg in args)
 
-        def convert_formula(gate, nest=False):
-            """Converts the formula of a gate into XML representation."""
-            mef_xml = ""
+        def convert_formula(gate, parts, nest=False):
+            """Appends the XML representation of the gate formula."""
             if gate.operator != "null":
-                mef_xml += "<" + gate.operator
                 if gate.operator == "atleast":
-                    mef_xml += " min=\"" + str(gate.k_num) + "\""
-                mef_xml += ">\n"
-            mef_xml += args_to_xml("house-event", gate.h_arguments)
-            mef_xml += args_to_xml("basic-event", gate.b_arguments)
-            mef_xml += args_to_xml("event", gate.u_arguments)
-
-            def converter(arg_gate):
-                """Converter for single nesting NOT connective."""
-                if gate.operator != "not" and arg_gate.operator == "not":
-                    return convert_formula(arg_gate)
-                return arg_to_xml("gate", arg_gate)
+                    parts.append("<atleast min=\"%s\">\n" % gate.k_num)
+                else:
+                    parts.append(_OPEN_TAGS[gate.operator])
+            args_to_xml("house-event", gate.h_arguments, parts)
+            args_to_xml("basic-event", gate.b_arguments, parts)
+            args_to_xml("event", gate.u_arguments, parts)
 
             if nest:
-                mef_xml += "".join(converter(x) for x in gate.g_arguments)
+                for arg_gate in gate.g_arguments:
+                    # Single nesting NOT connective.
+                    if gate.operator != "not" and arg_gate.operator == "not":
+                        convert_formula(arg_gate, parts)
+                    else:
+                        args_to_xml("gate", (arg_gate,), parts)
             else:
-                mef_xml += args_to_xml("gate", gate.g_arguments)
+                args_to_xml("gate", gate.g_arguments, parts)
 
             if gate.operator != "null":
-                mef_xml += "</" + gate.operator + ">"
-            return mef_xml
+                parts.append(_CLOSE_TAGS[gate.operator])
 
-        printer('<define-gate name="', self.name, '">')
-        printer(convert_formula(self, nest))
-        printer('</define-gate>')
+        parts = ['<define-gate name="%s">\n' % self.name]
+        convert_formula(self, parts, nest)
+        parts.append('\n</define-gate>')
+        printer("".join(parts))
 
     def to_aralia(self, printer):
         """Produces the Aralia definition of the gate.
@@ -302,7 +317,11 @@ class CcfGroup:  # pylint: disable=too-few-public-methods
         self.factors = []
 
     def to_xml(self, printer):
-        """Produces the Open-PSA MEF XML definition of the CCF group."""
+        """Produces the Open-PSA MEF XML definition of the CCF group.
+
+        The numbers are written with the same fixed precision
+        as basic event probabilities.
+        """
         printer('<define-CCF-group name="', self.name, '"', ' model="',
                 self.model, '">')
         printer('<members>')
@@ -311,7 +330,7 @@ class CcfGroup:  # pylint: disable=too-few-public-methods
         printer('</members>')
 
         printer('<distribution>')
-        printer('<float value="', self.prob, '"/>')
+        printer('<float value="%.6e"/>' % self.prob)
         printer('</distribution>')
 
         printer('<factors>')
@@ -320,7 +339,7 @@ class CcfGroup:  # pylint: disable=too-few-public-methods
         level = 2
         for factor in self.factors:
             printer('<factor level="', level, '">')
-            printer('<float value="', factor, '"/>')
+            printer('<float value="%.6e"/>' % factor)
             printer('</factor>')
             level += 1
         printer('</factors>')
@@ -41,6 +41,7 @@ guaranteed to be preserved and used as they are.
 
 # pylint: disable=too-many-lines
 
+from bisect import bisect_right
 from collections import deque
 import random
 import sys
@@ -271,10 +272,7 @@ class Factors:  # pylint: disable=too-many-instance-attributes
         Returns:
             A randomly chosen gate operator.
         """
-        r_num = random.random()
-        bin_num = 1
-        while self.__cum_dist[bin_num] <= r_num:
-            bin_num += 1
+        bin_num = bisect_right(self.__cum_dist, random.random())
         return Factors.__OPERATORS[bin_num - 1]
 
     def get_num_args(self, gate):
@@ -434,7 +432,7 @@ class GeneratorFaultTree(FaultTree):
         Returns:
             A fully initialized gate with random attributes.
         """
-        gate = Gate("G" + str(len(self.gates) + 1),
+        gate = Gate("G%d" % (len(self.gates) + 1),
                     self.factors.get_random_operator())
         self.gates.append(gate)
         return gate
@@ -445,9 +443,10 @@ class GeneratorFaultTree(FaultTree):
         Returns:
             A fully initialized basic event with a random probability.
         """
-        basic_event = BasicEvent(
-            "B" + str(len(self.basic_events) + 1),
-            random.uniform(self.factors.min_prob, self.factors.max_prob))
+        # The same sample as random.uniform without the extra call frame.
+        min_prob = self.factors.min_prob
+        prob = min_prob + (self.factors.max_prob - min_prob) * random.random()
+        basic_event = BasicEvent("B%d" % (len(self.basic_events) + 1), prob)
         self.basic_events.append(basic_event)
         return basic_event
 
@@ -457,7 +456,7 @@ class GeneratorFaultTree(FaultTree):
         Returns:
             A fully initialized house event with a random state.
         """
-        house_event = HouseEvent("H" + str(len(self.house_events) + 1),
+        house_event = HouseEvent("H%d" % (len(self.house_events) + 1),
                                  random.choice(["true", "false"]))
         self.house_events.append(house_event)
         return house_event
@@ -472,7 +471,7 @@ class GeneratorFaultTree(FaultTree):
             A fully initialized CCF group with random factors.
         """
         assert len(members) > 1
-        ccf_group = CcfGroup("CCF" + str(len(self.ccf_groups) + 1))
+        ccf_group = CcfGroup("CCF%d" % (len(self.ccf_groups) + 1))
         self.ccf_groups.append(ccf_group)
         ccf_group.members = members
         ccf_group.prob = random.uniform(self.factors.min_prob,
@@ -508,12 +507,31 @@ def candidate_gates(common_gate):
         yield i
 
 
+def choose_parent_gate(common_gate, fault_tree):
+    """Randomly chooses a gate that can accept one more gate argument.
+
+    Args:
+        common_gate: A list of common gates.
+        fault_tree: The fault tree container of all events and constructs.
+
+    Returns:
+        A gate with a variable number of arguments that is not common.
+    """
+    random_gate = random.choice(fault_tree.gates)
+    while (random_gate.operator == "not" or random_gate.operator == "xor" or
+           random_gate in common_gate):
+        random_gate = random.choice(fault_tree.gates)
+    return random_gate
+
+
 def correct_for_exhaustion(gates_queue, common_gate, fault_tree):
     """Corrects the generation for queue exhaustion.
 
     Corner case when not enough new basic events initialized,
     but there are no more intermediate gates to use
     due to a big ratio or just random accident.
+    If all the basic events are already initialized,
+    the remaining orphan common gates are attached to the fault tree.
 
     Args:
         gates_queue: A deque of gates to be initialized.
@@ -525,38 +543,151 @@ def correct_for_exhaustion(gates_queue, common_gate, fault_tree):
     if len(fault_tree.basic_events) < fault_tree.factors.num_basic:
         # Initialize one more gate
         # by randomly choosing places in the fault tree.
-        random_gate = random.choice(fault_tree.gates)
-        while (random_gate.operator == "not" or random_gate.operator == "xor" or
-               random_gate in common_gate):
-            random_gate = random.choice(fault_tree.gates)
+        random_gate = choose_parent_gate(common_gate, fault_tree)
         new_gate = fault_tree.construct_gate()
         random_gate.add_argument(new_gate)
         gates_queue.append(new_gate)
+        return
+    # Orphan common gates are not initialized yet,
+    # so they cannot introduce cycles.
+    for orphan in [x for x in common_gate if not x.parents]:
+        choose_parent_gate(common_gate, fault_tree).add_argument(orphan)
+        gates_queue.append(orphan)
+
+
+class CommonBasicEvents:
+    """Common basic events grouped by the number of their parents.
 
+    The groups are maintained incrementally upon choices
+    instead of filtering all the common basic events for every argument.
 
-def choose_basic_event(s_common, common_basic, fault_tree):
+    Attributes:
+        events: A list of all common basic events.
+        orphans: A list of common basic events without parents.
+        single_parent: A list of common basic events with one parent.
+    """
+
+    def __init__(self, events):
+        """Groups common basic events.
+
+        Args:
+            events: A list of common basic events.
+        """
+        self.events = events
+        self.orphans = [x for x in events if not x.parents]
+        self.single_parent = [x for x in events if len(x.parents) == 1]
+
+    @staticmethod
+    def __swap_remove(events, index):
+        """Removes the event at the index in constant time."""
+        events[index] = events[-1]
+        events.pop()
+
+    def choose(self, gate):
+        """Randomly chooses a common basic event as an argument of the gate.
+
+        Orphans are chosen first, then events with a single parent.
+        The chosen event is expected to be added into the gate arguments.
+
+        Args:
+            gate: The gate under initialization.
+
+        Returns:
+            A common basic event.
+        """
+        if self.orphans:
+            index = random.randrange(len(self.orphans))
+            basic_event = self.orphans[index]
+            CommonBasicEvents.__swap_remove(self.orphans, index)
+            self.single_parent.append(basic_event)
+            return basic_event
+
+        if self.single_parent:
+            index = random.randrange(len(self.single_parent))
+            basic_event = self.single_parent[index]
+            if basic_event not in gate.b_arguments:  # Gets the second parent.
+                CommonBasicEvents.__swap_remove(self.single_parent, index)
+            return basic_event
+
+        return random.choice(self.events)
+
+    def regroup(self, basic_event, gate):
+        """Accounts for a basic event chosen outside of this container.
+
+        This is a linear-time fallback for rare choices.
+
+        Args:
+            basic_event: The basic event to be added into the gate arguments.
+            gate: The gate under initialization.
+        """
+        if basic_event in gate.b_arguments:
+            return  # The number of parents does not change.
+        if basic_event in self.orphans:
+            self.orphans.remove(basic_event)
+            self.single_parent.append(basic_event)
+        elif basic_event in self.single_parent:
+            self.single_parent.remove(basic_event)
+
+
+def choose_basic_event(s_common, common_basic, gate, fault_tree):
     """Creates a new basic event or uses a common one for gate arguments.
 
     Args:
         s_common: Sampled factor to choose common basic events.
-        common_basic: A list of common basic events to choose from.
+        common_basic: Common basic events to choose from.
+        gate: The gate under initialization.
         fault_tree: The fault tree container of all events and constructs.
 
     Returns:
         Basic event argument for a gate.
     """
-    if s_common >= fault_tree.factors.common_b or not common_basic:
+    if s_common >= fault_tree.factors.common_b:
         return fault_tree.construct_basic_event()
+    if len(fault_tree.basic_events) < fault_tree.factors.num_basic:
+        if not common_basic.events:
+            return fault_tree.construct_basic_event()
+        return common_basic.choose(gate)
+    # No new basic events are allowed,
+    # so any basic event is reused if common ones are exhausted for the gate.
+    if common_basic.events:
+        basic_event = common_basic.choose(gate)
+        if basic_event not in gate.b_arguments:
+            return basic_event
+    if len(gate.b_arguments) == len(fault_tree.basic_events):
+        # Too few basic events for the gate; the only way to terminate.
+        return fault_tree.construct_basic_event()
+    basic_event = random.choice(fault_tree.basic_events)
+    common_basic.regroup(basic_event, gate)
+    return basic_event
 
-    orphans = [x for x in common_basic if not x.parents]
-    if orphans:
-        return random.choice(orphans)
 
-    single_parent = [x for x in common_basic if len(x.parents) == 1]
-    if single_parent:
-        return random.choice(single_parent)
+def choose_common_gate(gate, common_gate, num_tries, ancestors):
+    """Chooses a common gate that can be an argument of the given gate.
 
-    return random.choice(common_basic)
+    Args:
+        gate: The gate under initialization.
+        common_gate: A list of common gates.
+        num_tries: The number of tries already spent on common gates.
+        ancestors: A set of the gate ancestors filled on the first need.
+
+    Returns:
+        The chosen gate or None,
+        and the updated number of tries to get a common gate.
+    """
+    for random_gate in candidate_gates(common_gate):
+        if num_tries >= len(common_gate):
+            break
+        num_tries += 1
+        if random_gate in gate.g_arguments or random_gate is gate:
+            continue
+        # Only gates with gate arguments can introduce cycles.
+        if random_gate.g_arguments:
+            if not ancestors:  # Lazy evaluation of ancestors
+                ancestors.update(gate.get_ancestors())
+            if random_gate in ancestors:
+                continue
+        return random_gate, num_tries
+    return None, num_tries
 
 
 def init_gates(gates_queue, common_basic, common_gate, fault_tree):
@@ -564,56 +695,54 @@ def init_gates(gates_queue, common_basic, common_gate, fault_tree):
 
     Args:
         gates_queue: A deque of gates to be initialized.
-        common_basic: A list of common basic events.
+        common_basic: Common basic events.
         common_gate: A list of common gates.
         fault_tree: The fault tree container of all events and constructs.
     """
     # Get an intermediate gate to initialize breadth-first
     gate = gates_queue.popleft()
 
-    num_arguments = fault_tree.factors.get_num_args(gate)
+    num_left = fault_tree.factors.get_num_args(gate) - gate.num_arguments()
 
-    ancestors = None  # needed for cycle prevention
-    max_tries = len(common_gate)  # the number of maximum tries
+    ancestors = set()  # needed for cycle prevention
     num_tries = 0  # the number of tries to get a common gate
 
+    # Loop invariants
+    percent_gate = fault_tree.factors.get_percent_gate()
+    basic_events = fault_tree.basic_events
+
     # pylint: disable=too-many-nested-blocks
     # This code is both hot and coupled for performance reasons.
     # There may be a better solution than the current approach.
-    while gate.num_arguments() < num_arguments:
+    while num_left > 0:
         s_percent = random.random()  # sample percentage of gates
         s_common = random.random()  # sample the reuse frequency
 
         # Case when the number of basic events is already satisfied
-        if len(fault_tree.basic_events) == fault_tree.factors.num_basic:
+        satisfied = len(basic_events) >= fault_tree.factors.num_basic
+        if satisfied:
             s_common = 0  # use only common nodes
 
-        if s_percent < fault_tree.factors.get_percent_gate():
+        # New gates are not created to satisfy the common node requirement.
+        if (s_percent < percent_gate and
+                (num_tries < len(common_gate) or not satisfied)):
             # Create a new gate or use a common one
-            if s_common < fault_tree.factors.common_g and num_tries < max_tries:
-                # Lazy evaluation of ancestors
-                if not ancestors:
-                    ancestors = gate.get_ancestors()
-
-                for random_gate in candidate_gates(common_gate):
-                    num_tries += 1
-                    if num_tries >= max_tries:
-                        break
-                    if random_gate in gate.g_arguments or random_gate is gate:
-                        continue
-                    if (not random_gate.g_arguments or
-                            random_gate not in ancestors):
-                        if not random_gate.parents:
-                            gates_queue.append(random_gate)
-                        gate.add_argument(random_gate)
-                        break
+            if (s_common < fault_tree.factors.common_g and
+                    num_tries < len(common_gate)):
+                random_gate, num_tries = choose_common_gate(
+                    gate, common_gate, num_tries, ancestors)
+                if random_gate is None:
+                    continue
+                if not random_gate.parents:
+                    gates_queue.append(random_gate)
             else:
-                new_gate = fault_tree.construct_gate()
-                gate.add_argument(new_gate)
-                gates_queue.append(new_gate)
-        else:
-            gate.add_argument(
-                choose_basic_event(s_common, common_basic, fault_tree))
+                random_gate = fault_tree.construct_gate()
+                gates_queue.append(random_gate)
+            gate.add_argument(random_gate)
+            num_left -= 1
+        elif gate.add_argument(
+                choose_basic_event(s_common, common_basic, gate, fault_tree)):
+            num_left -= 1  # Duplicates are ignored.
 
     correct_for_exhaustion(gates_queue, common_gate, fault_tree)
 
@@ -674,9 +803,9 @@ def generate_fault_tree(ft_name, root_name, factors):
     num_gate = factors.get_num_gate()
     num_common_basic = factors.get_num_common_basic(num_gate)
     num_common_gate = factors.get_num_common_gate(num_gate)
-    common_basic = [
+    common_basic = CommonBasicEvents([
         fault_tree.construct_basic_event() for _ in range(num_common_basic)
-    ]
+    ])
     common_gate = [fault_tree.construct_gate() for _ in range(num_common_gate)]
 
     # Container for not yet initialized gates
@@ -776,8 +905,12 @@ def calculate_complexity_factors(fault_tree):
         if gate.g_arguments:
             num_common_g = len([x for x in gate.g_arguments if x.is_common()])
             common_g += num_common_g / num_g_arguments
-    common_b /= len([x for x in fault_tree.gates if x.b_arguments])
-    common_g /= len([x for x in fault_tree.gates if x.g_arguments])
+    num_b_parents = len([x for x in fault_tree.gates if x.b_arguments])
+    num_g_parents = len([x for x in fault_tree.gates if x.g_arguments])
+    if num_b_parents:  # Tiny trees may have only basic or gate arguments.
+        common_b /= num_b_parents
+    if num_g_parents:
+        common_g /= num_g_parents
     frac_b /= len(fault_tree.gates)
     return frac_b, common_b, common_g
 
@@ -989,7 +1122,21 @@ def main(argv=None):
     args = manage_cmd_args(argv)
     factors = setup_factors(args)
     fault_tree = generate_fault_tree(args.ft_name, args.root, factors)
-    printer = get_printer(args.out)
+    if not args.out:
+        write_fault_tree(fault_tree, get_printer(sys.stdout), args)
+        return
+    with open(args.out, 'w', buffering=1 << 20) as destination:
+        write_fault_tree(fault_tree, get_printer(destination), args)
+
+
+def write_fault_tree(fault_tree, printer, args):
+    """Writes the generated fault tree in the requested format.
+
+    Args:
+        fault_tree: A full, valid, well-formed fault tree.
+        printer: The output stream.
+        args: Command-line arguments with the output options.
+    """
     if args.aralia:
         fault_tree.to_aralia(printer)
     else:
@@ -998,12 +1145,13 @@ def main(argv=None):
         fault_tree.to_xml(printer, args.nest)
 
 
-def get_printer(file_path=None):
-    """Returns printer to stream output."""
-    destination = open(file_path, 'w') if file_path else sys.stdout
+def get_printer(destination):
+    """Returns printer to stream output into the open destination file."""
+    write = destination.write
 
     def _print(*args):
-        print(*args, file=destination, sep='')
+        # One write per line instead of one per argument with print().
+        write("".join(map(str, args)) + "\n")
 
     return _print
 
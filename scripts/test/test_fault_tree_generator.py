@@ -22,8 +22,10 @@ from unittest import TestCase
 from lxml import etree
 import pytest
 
-from fault_tree_generator import FactorError, Factors, generate_fault_tree, \
-    write_info, write_summary, main
+from fault_tree import BasicEvent, Gate
+from fault_tree_generator import FactorError, Factors, CommonBasicEvents, \
+    generate_fault_tree, write_info, write_summary, main, manage_cmd_args, \
+    setup_factors
 
 # pylint: disable=redefined-outer-name
 
@@ -137,6 +139,61 @@ def test_constrain_num_gates(factors):
         factors.constrain_num_gate(50)  # unsatisfiable
 
 
+def test_common_basic_events_progression():
+    """Checks the orphan, single-parent, multi-parent grouping progression."""
+    basic_event = BasicEvent("B1", 0.1)
+    common_basic = CommonBasicEvents([basic_event])
+    assert common_basic.orphans == [basic_event]
+    assert not common_basic.single_parent
+
+    first_gate = Gate("G1", "and")
+    assert common_basic.choose(first_gate) is basic_event
+    first_gate.add_argument(basic_event)
+    assert not common_basic.orphans
+    assert common_basic.single_parent == [basic_event]
+
+    second_gate = Gate("G2", "and")
+    assert common_basic.choose(second_gate) is basic_event
+    second_gate.add_argument(basic_event)
+    assert not common_basic.orphans
+    assert not common_basic.single_parent
+
+    assert common_basic.choose(Gate("G3", "and")) is basic_event
+
+
+def test_common_basic_events_duplicate():
+    """Checks that a duplicate choice keeps the single-parent grouping."""
+    basic_event = BasicEvent("B1", 0.1)
+    common_basic = CommonBasicEvents([basic_event])
+    gate = Gate("G1", "and")
+    gate.add_argument(common_basic.choose(gate))
+    assert common_basic.choose(gate) is basic_event
+    assert not gate.add_argument(basic_event)
+    assert common_basic.single_parent == [basic_event]
+
+
+def test_common_basic_events_regroup():
+    """Checks regrouping of common events chosen outside of the groups."""
+    orphan = BasicEvent("B1", 0.1)
+    single = BasicEvent("B2", 0.1)
+    parent = Gate("G1", "and")
+    parent.add_argument(single)
+    common_basic = CommonBasicEvents([orphan, single])
+    assert common_basic.orphans == [orphan]
+    assert common_basic.single_parent == [single]
+
+    common_basic.regroup(single, parent)  # duplicate
+    assert common_basic.single_parent == [single]
+
+    gate = Gate("G2", "and")
+    common_basic.regroup(orphan, gate)
+    gate.add_argument(orphan)
+    common_basic.regroup(single, gate)
+    gate.add_argument(single)
+    assert not common_basic.orphans
+    assert common_basic.single_parent == [orphan]
+
+
 class FaultTreeGeneratorTestCase(TestCase):
     """General tests for the fault tree generator script."""
 
@@ -200,6 +257,26 @@ class FaultTreeGeneratorTestCase(TestCase):
         assert abs(1 - len(fault_tree.gates) / 200) < 0.1
 
 
+@pytest.mark.parametrize("num_basic", [1, 2, 20, 50, 80])
+@pytest.mark.parametrize("weights", [[], ["1", "1", "1", "0.1", "0.1"],
+                                     ["1", "1", "1", "1", "1"]])
+def test_small_fault_trees(num_basic, weights):
+    """Checks generation of small trees with few or no common events."""
+    for seed in range(1, 21):
+        argv = ["--seed", str(seed), "-b", str(num_basic)]
+        if weights:
+            argv += ["--weights-g"] + weights
+        args = manage_cmd_args(argv)
+        fault_tree = generate_fault_tree(args.ft_name, args.root,
+                                         setup_factors(args))
+        # Gates may need more distinct arguments than in tiny trees.
+        assert len(fault_tree.basic_events) >= num_basic
+        if num_basic > 2:
+            assert len(fault_tree.basic_events) == num_basic
+        write_summary(fault_tree, lambda *args: None)
+        fault_tree.to_xml(lambda *args: None)  # checks for cycles
+
+
 def test_main():
     """Tests the main() of the generator."""
     tmp = NamedTemporaryFile(mode="w+")